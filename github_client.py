@@ -4,43 +4,221 @@ Wraps PyGithub with lazy initialization so the server can start
 without a token and return clear errors when tools are invoked.
 """
 
+import copy
+import functools
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 
 from github import Github, Auth
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://api.github.com"
+
+# Connection pool shared by all tool calls (keep-alive, sized for concurrency).
+# The server sizes its tool worker threads to match.
+POOL_SIZE = 32
+
+# Large enough that the 50-item list tools fit in a single page
+PER_PAGE = 100
+
+# Transport retries cover connection errors and 5xx only. Rate limits (403/429)
+# are left to tools._handle_errors, which caps how long it will wait.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[500, 502, 503, 504],
+    respect_retry_after_header=False,  # else urllib3 retries 429s itself
+    raise_on_status=False,
+)
+
+
+# Max GET responses kept for ETag revalidation, and the largest body kept.
+# Bigger responses (large files, blobs) are not cached.
+ETAG_CACHE_SIZE = 256
+ETAG_MAX_BODY = 1_000_000  # bytes
+
+# Fully fetched Repository objects reused across tool calls
+REPO_CACHE_SIZE = 64
+REPO_CACHE_TTL = 300  # seconds
 
 
 class GitHubClientError(Exception):
     """Raised when the GitHub client cannot be used."""
 
 
+class ETagCacheAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates cached GET responses with If-None-Match.
+
+    GitHub answers 304 Not Modified for unchanged resources, and 304s do not
+    count against the primary rate limit. Entries are keyed by URL plus a
+    hash of the Authorization header so different tokens never share data.
+    Bodies over max_body bytes are passed through uncached.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_entries: int = ETAG_CACHE_SIZE,
+        max_body: int = ETAG_MAX_BODY,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._max_entries = max_entries
+        self._max_body = max_body
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or "If-None-Match" in request.headers:
+            return super().send(request, **kwargs)
+
+        auth = request.headers.get("Authorization", "")
+        key = (request.url, hashlib.sha256(auth.encode()).hexdigest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        if cached is not None:
+            request.headers["If-None-Match"] = cached.headers["ETag"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            # Serve the cached body with fresh headers (rate-limit counters etc.)
+            merged = copy.copy(cached)
+            merged.headers = CaseInsensitiveDict(cached.headers)
+            merged.headers.update(response.headers)
+            merged.status_code = 200
+            merged.request = request
+            return merged
+
+        if (
+            response.status_code == 200
+            and "ETag" in response.headers
+            and len(response.content) <= self._max_body
+        ):
+            with self._lock:
+                self._entries[key] = response
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return response
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize(repo_name: str, username: str) -> str:
+    """Normalize 'repo' to 'owner/repo' (defaults to username)."""
+    return repo_name if "/" in repo_name else f"{username}/{repo_name}"
+
+
+def _install_etag_cache(github: Github) -> None:
+    """Mount an ETagCacheAdapter on PyGithub's persistent session."""
+    connection = github.requester._Requester__createConnection()
+    connection.session.mount(
+        f"{connection.protocol}://",
+        ETagCacheAdapter(
+            max_retries=connection.retry,
+            pool_connections=connection.pool_size,
+            pool_maxsize=connection.pool_size,
+        ),
+    )
+
+
 class GitHubClient:
-    """Lazy-initializing GitHub API client."""
+    """Lazy-initializing GitHub API client.
+
+    Initialization is double-checked under a lock so concurrent tool calls
+    on a cold client build a single Github instance (and connection pool).
+    """
+
+    __slots__ = ("_github", "_username", "_lock", "_repos")
 
     def __init__(self):
         self._github: Github | None = None
         self._username: str = "EvieHwang"
+        self._lock = threading.Lock()
+        self._repos: OrderedDict = OrderedDict()
 
     @property
     def github(self) -> Github:
         if self._github is None:
-            token = os.environ.get("GITHUB_TOKEN")
-            if not token:
-                raise GitHubClientError(
-                    "GITHUB_TOKEN environment variable is not set. "
-                    "Cannot access GitHub API."
-                )
-            self._github = Github(auth=Auth.Token(token))
+            with self._lock:
+                if self._github is None:
+                    token = os.environ.get("GITHUB_TOKEN")
+                    if not token:
+                        raise GitHubClientError(
+                            "GITHUB_TOKEN environment variable is not set. "
+                            "Cannot access GitHub API."
+                        )
+                    github = Github(
+                        auth=Auth.Token(token),
+                        base_url=BASE_URL,
+                        per_page=PER_PAGE,
+                        pool_size=POOL_SIZE,
+                        retry=RETRY,
+                    )
+                    _install_etag_cache(github)
+                    self._github = github
         return self._github
 
     @property
     def user(self):
         return self.github.get_user()
 
+    def full_name(self, repo_name: str) -> str:
+        """Normalize 'repo' to 'owner/repo' (defaults to user)."""
+        return _normalize(repo_name, self._username)
+
     def get_repo(self, repo_name: str):
-        """Get a repo by name. Accepts 'owner/repo' or just 'repo' (defaults to user)."""
-        if "/" not in repo_name:
-            repo_name = f"{self._username}/{repo_name}"
-        return self.github.get_repo(repo_name)
+        """Get a repo by name. Accepts 'owner/repo' or just 'repo' (defaults to user).
+
+        Fetched repos are cached for REPO_CACHE_TTL seconds.
+        """
+        full_name = self.full_name(repo_name)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._repos.get(full_name)
+            if cached is not None and cached[0] > now:
+                self._repos.move_to_end(full_name)
+                return cached[1]
+
+        repo = self.github.get_repo(full_name)
+        with self._lock:
+            self._repos[full_name] = (now + REPO_CACHE_TTL, repo)
+            self._repos.move_to_end(full_name)
+            while len(self._repos) > REPO_CACHE_SIZE:
+                self._repos.popitem(last=False)
+        return repo
+
+    def invalidate_repo(self, repo_name: str) -> None:
+        """Drop a cached repo after a change to it."""
+        with self._lock:
+            self._repos.pop(self.full_name(repo_name), None)
+
+    def lazy_repo(self, repo_name: str):
+        """Get a lazy repo handle without fetching repo metadata.
+
+        Use for operations on child resources (issues, pulls, contents, refs)
+        so each tool call costs one API request instead of two.
+        """
+        return self.github.get_repo(self.full_name(repo_name), lazy=True)
+
+    def rest(self, verb: str, url: str, parameters: dict | None = None) -> dict:
+        """Make a raw REST call and return the JSON body, skipping object hydration."""
+        _, data = self.github.requester.requestJsonAndCheck(
+            verb, url, parameters=parameters
+        )
+        return data
+
+    def graphql(self, query: str, variables: dict | None = None) -> dict:
+        """Run a GraphQL v4 query and return its 'data' payload."""
+        _, data = self.github.requester.graphql_query(query, variables or {})
+        return data["data"]
 
 
 # Module-level singleton
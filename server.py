@@ -1,5 +1,17 @@
+import asyncio
+import hashlib
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import fastmcp
 from fastmcp import FastMCP
+from fastmcp.server.lifespan import lifespan
+from mcp import types as mcp_types
 
+import tools
+from github_client import POOL_SIZE
 from tools import (
     create_branch,
     create_issue,
@@ -18,6 +30,16 @@ from tools import (
     write_file,
 )
 
+
+@lifespan
+async def tool_executor(server):
+    """Run tool bodies on one worker thread per pooled GitHub connection."""
+    executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="github")
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield {}
+    executor.shutdown(wait=False)
+
+
 mcp = FastMCP(
     name="GitHub",
     instructions=(
@@ -27,6 +49,7 @@ mcp = FastMCP(
         "list_prs for pull requests. "
         "Repo names can be 'repo-name' (defaults to EvieHwang) or 'owner/repo'."
     ),
+    lifespan=tool_executor,
 )
 
 READ_ONLY = {
@@ -59,6 +82,69 @@ mcp.tool(annotations=READ_ONLY)(search_code)
 mcp.tool(annotations=READ_ONLY)(get_pr)
 mcp.tool(annotations=WRITE)(merge_pr)
 
+# --- Tool catalog cache ---
+
+TOOL_CACHE_PATH = Path.home() / ".cache" / "eviebot-mcp" / "tools.json"
+
+_tool_catalog: list[mcp_types.Tool] | None = None
+
+
+def _tool_cache_key() -> str:
+    """Hash of everything that shapes the tool schemas."""
+    h = hashlib.sha256()
+    h.update(inspect.getsource(tools).encode())
+    h.update(Path(__file__).read_bytes())
+    h.update(fastmcp.__version__.encode())
+    return h.hexdigest()
+
+
+def _load_tool_cache(key: str) -> list[mcp_types.Tool] | None:
+    try:
+        data = json.loads(TOOL_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key:
+        return None
+    return [mcp_types.Tool.model_validate(t) for t in data["tools"]]
+
+
+def _save_tool_cache(key: str, catalog: list[mcp_types.Tool]) -> None:
+    try:
+        TOOL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        TOOL_CACHE_PATH.write_text(
+            json.dumps(
+                {
+                    "key": key,
+                    "tools": [
+                        t.model_dump(mode="json", by_alias=True, exclude_none=True)
+                        for t in catalog
+                    ],
+                }
+            )
+        )
+    except OSError:
+        pass
+
+
+async def _list_tools_cached(
+    request: mcp_types.ListToolsRequest,
+) -> mcp_types.ListToolsResult:
+    """Serve tools/list from the on-disk catalog when the cache key matches."""
+    global _tool_catalog
+    if request is not None and request.params and request.params.cursor:
+        return await mcp._list_tools_mcp(request)
+    if _tool_catalog is None:
+        key = _tool_cache_key()
+        _tool_catalog = _load_tool_cache(key)
+        if _tool_catalog is None:
+            result = await mcp._list_tools_mcp(request)
+            _tool_catalog = result.tools
+            _save_tool_cache(key, _tool_catalog)
+    return mcp_types.ListToolsResult(tools=_tool_catalog)
+
+
+mcp._mcp_server.list_tools()(_list_tools_cached)
+
 if __name__ == "__main__":
     mcp.run(
         transport="http",
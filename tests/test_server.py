@@ -0,0 +1,48 @@
+"""Tests for the server's tool catalog cache."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from mcp import types as mcp_types
+
+import server
+
+
+async def list_tools():
+    handler = server.mcp._mcp_server.request_handlers[mcp_types.ListToolsRequest]
+    return (await handler(mcp_types.ListToolsRequest(method="tools/list"))).root
+
+
+@pytest.mark.asyncio
+class TestToolCatalogCache:
+    @pytest.fixture(autouse=True)
+    def _cache_path(self, tmp_path):
+        with patch.object(server, "TOOL_CACHE_PATH", tmp_path / "tools.json"):
+            server._tool_catalog = None
+            yield
+            server._tool_catalog = None
+
+    async def test_writes_cache_on_first_list(self):
+        result = await list_tools()
+
+        data = json.loads(server.TOOL_CACHE_PATH.read_text())
+        assert data["key"] == server._tool_cache_key()
+        assert [t["name"] for t in data["tools"]] == [t.name for t in result.tools]
+
+    async def test_serves_from_cache_when_key_matches(self):
+        expected = (await list_tools()).tools
+        server._tool_catalog = None
+
+        with patch.object(server.mcp, "_list_tools_mcp") as mock_list:
+            result = await list_tools()
+
+        mock_list.assert_not_called()
+        assert result.tools == expected
+
+    async def test_stale_key_is_ignored(self):
+        server.TOOL_CACHE_PATH.write_text(json.dumps({"key": "stale", "tools": []}))
+
+        result = await list_tools()
+
+        assert len(result.tools) == 15
@@ -1,16 +1,85 @@
 """Tests for GitHub MCP tools."""
 
-import asyncio
+import json
 import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from github_client import GitHubClient, GitHubClientError
-
-
-def run(coro):
-    return asyncio.get_event_loop().run_until_complete(coro)
+import requests
+from requests.adapters import HTTPAdapter
+
+from github_client import ETagCacheAdapter, GitHubClient, GitHubClientError
+
+ISSUE_JSON = {
+    "number": 1,
+    "title": "Some issue",
+    "state": "open",
+    "labels": [],
+    "assignees": [],
+    "comments": 0,
+    "created_at": "2026-02-27T00:00:00Z",
+    "updated_at": "2026-02-27T01:00:00Z",
+    "html_url": "https://github.com/EvieHwang/repo/issues/1",
+    "body": "",
+}
+
+
+class FakeGitHub:
+    """Local HTTP server standing in for api.github.com.
+
+    Queue responses with respond(); each request is recorded along with the
+    client port, which identifies the connection that carried it.
+    """
+
+    def __init__(self):
+        self.responses = deque()
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                fake.requests.append((self.command, self.path, self.client_address[1]))
+                status, headers, body = fake.responses.popleft()
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, status, body, headers=None):
+        self.responses.append((status, headers or {}, body))
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_github():
+    """Point a fresh client, used by the tools, at a FakeGitHub server."""
+    fake = FakeGitHub()
+    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake"}), patch(
+        "github_client.BASE_URL", fake.url
+    ), patch("tools.client", GitHubClient()):
+        yield fake
+    fake.close()
 
 
 class TestGitHubClient:
@@ -20,6 +89,44 @@ class TestGitHubClient:
             with pytest.raises(GitHubClientError, match="GITHUB_TOKEN"):
                 _ = c.github
 
+    def test_github_built_once_with_pooling(self):
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "fake"}):
+            c = GitHubClient()
+            with patch("github_client.Github") as mock_cls:
+                first = c.github
+                second = c.github
+        assert first is second
+        mock_cls.assert_called_once()
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs["pool_size"] == 32
+        assert kwargs["per_page"] == 100
+        assert 403 not in kwargs["retry"].status_forcelist
+
+    def test_concurrent_init_builds_once(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_github(*args, **kwargs):
+            entered.set()
+            release.wait(timeout=5)
+            return MagicMock()
+
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "fake"}):
+            c = GitHubClient()
+            with patch("github_client.Github", side_effect=slow_github) as mock_cls:
+                threads = [
+                    threading.Thread(target=lambda: c.github) for _ in range(8)
+                ]
+                for t in threads:
+                    t.start()
+                # Hold the first builder until every thread has hit the cold path
+                assert entered.wait(timeout=5)
+                time.sleep(0.1)
+                release.set()
+                for t in threads:
+                    t.join()
+        mock_cls.assert_called_once()
+
     def test_get_repo_adds_owner(self):
         with patch.dict(os.environ, {"GITHUB_TOKEN": "fake"}):
             c = GitHubClient()
@@ -38,9 +145,136 @@ class TestGitHubClient:
             c.get_repo("other/repo")
             mock_gh.get_repo.assert_called_with("other/repo")
 
+    def test_get_repo_is_cached_until_invalidated(self):
+        c = GitHubClient()
+        mock_gh = MagicMock()
+        c._github = mock_gh
+
+        first = c.get_repo("my-repo")
+        assert c.get_repo("EvieHwang/my-repo") is first
+        assert mock_gh.get_repo.call_count == 1
+
+        c.invalidate_repo("my-repo")
+        c.get_repo("my-repo")
+        assert mock_gh.get_repo.call_count == 2
+
+    def test_get_repo_cache_expires(self):
+        c = GitHubClient()
+        mock_gh = MagicMock()
+        c._github = mock_gh
+
+        with patch("github_client.time.monotonic", side_effect=[0, 301]):
+            c.get_repo("my-repo")
+            c.get_repo("my-repo")
+        assert mock_gh.get_repo.call_count == 2
+
+    def test_lazy_repo_skips_fetch(self):
+        c = GitHubClient()
+        mock_gh = MagicMock()
+        c._github = mock_gh
+        c.lazy_repo("my-repo")
+        mock_gh.get_repo.assert_called_with("EvieHwang/my-repo", lazy=True)
+
+
+def fake_response(status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class TestETagCacheAdapter:
+    def _get(self, url="https://api.github.com/repos/o/r"):
+        return requests.Request(
+            "GET", url, headers={"Authorization": "token x"}
+        ).prepare()
+
+    def test_revalidates_and_replays_body(self):
+        adapter = ETagCacheAdapter()
+        first = fake_response(200, b'{"a": 1}', {"ETag": '"abc"'})
+        not_modified = fake_response(304, headers={"X-RateLimit-Remaining": "4999"})
+
+        with patch.object(HTTPAdapter, "send", side_effect=[first, not_modified]):
+            adapter.send(self._get())
+            second_request = self._get()
+            result = adapter.send(second_request)
+
+        assert second_request.headers["If-None-Match"] == '"abc"'
+        assert result.status_code == 200
+        assert result.content == b'{"a": 1}'
+        assert result.headers["X-RateLimit-Remaining"] == "4999"
+
+    def test_non_get_is_not_cached(self):
+        adapter = ETagCacheAdapter()
+        request = requests.Request("POST", "https://api.github.com/graphql").prepare()
+        response = fake_response(200, b"{}", {"ETag": '"abc"'})
+
+        with patch.object(HTTPAdapter, "send", return_value=response):
+            adapter.send(request)
+            adapter.send(request)
+
+        assert "If-None-Match" not in request.headers
+
+    def test_large_bodies_are_not_cached(self):
+        adapter = ETagCacheAdapter(max_body=4)
+        responses = [
+            fake_response(200, b"12345", {"ETag": '"big"'}),
+            fake_response(200, b"12345", {"ETag": '"big"'}),
+        ]
+
+        with patch.object(HTTPAdapter, "send", side_effect=responses):
+            adapter.send(self._get())
+            again = self._get()
+            adapter.send(again)
+
+        assert "If-None-Match" not in again.headers
+
+    def test_evicts_oldest_entry(self):
+        adapter = ETagCacheAdapter(max_entries=1)
+        responses = [
+            fake_response(200, b"1", {"ETag": '"1"'}),
+            fake_response(200, b"2", {"ETag": '"2"'}),
+            fake_response(200, b"1", {"ETag": '"1"'}),
+        ]
+
+        with patch.object(HTTPAdapter, "send", side_effect=responses):
+            adapter.send(self._get("https://api.github.com/a"))
+            adapter.send(self._get("https://api.github.com/b"))
+            again = self._get("https://api.github.com/a")
+            adapter.send(again)
+
+        assert "If-None-Match" not in again.headers
+
+
+@pytest.mark.asyncio
+class TestTransport:
+    async def test_tool_calls_reuse_one_connection(self, fake_github):
+        import tools
+
+        for _ in range(3):
+            fake_github.respond(200, ISSUE_JSON)
+            result = await tools.get_issue("repo", 1)
+            assert result.startswith("#1 Some issue")
+
+        assert len(fake_github.requests) == 3
+        assert len({port for _, _, port in fake_github.requests}) == 1
 
+    async def test_server_errors_are_retried_by_transport(self, fake_github):
+        import tools
+
+        fake_github.respond(502, {"message": "Bad Gateway"})
+        fake_github.respond(200, ISSUE_JSON)
+        with patch("urllib3.util.retry.Retry.sleep"):
+            result = await tools.get_issue("repo", 1)
+
+        assert len(fake_github.requests) == 2
+        assert result.startswith("#1 Some issue")
+
+
+@pytest.mark.asyncio
 class TestToolErrorHandling:
-    def test_list_repos_without_token(self):
+    async def test_list_repos_without_token(self):
         """Tools should return an error string when no token is set."""
         with patch.dict(os.environ, {}, clear=True):
             # Re-import to get fresh client
@@ -52,10 +286,107 @@ class TestToolErrorHandling:
 
             importlib.reload(tools)
 
-            result = run(tools.list_repos())
+            result = await tools.list_repos()
             assert "GITHUB_TOKEN" in result
 
 
+@pytest.mark.asyncio
+class TestRateLimitRetry:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    def _rate_limited(self, headers):
+        from github import GithubException
+
+        return GithubException(403, {"message": "rate limit exceeded"}, headers)
+
+    async def test_retries_once_after_retry_after(self):
+        mock_repo = MagicMock()
+        mock_repo.get_issue.side_effect = [
+            self._rate_limited({"retry-after": "2"}),
+            MagicMock(body=""),
+        ]
+
+        with patch("tools.client") as mock_client, patch(
+            "tools.asyncio.sleep"
+        ) as mock_sleep:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.get_issue("repo", 1)
+
+        mock_sleep.assert_awaited_once_with(2.0)
+        assert mock_repo.get_issue.call_count == 2
+        assert "GitHub API error" not in result
+
+    async def test_http_date_retry_after_returns_github_error(self):
+        mock_repo = MagicMock()
+        mock_repo.get_issue.side_effect = self._rate_limited(
+            {"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}
+        )
+
+        with patch("tools.client") as mock_client, patch(
+            "tools.asyncio.sleep"
+        ) as mock_sleep:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.get_issue("repo", 1)
+
+        mock_sleep.assert_not_called()
+        assert result == "GitHub API error (403): rate limit exceeded"
+
+    async def test_primary_limit_through_transport(self, fake_github):
+        fake_github.respond(
+            403,
+            {"message": "API rate limit exceeded for user."},
+            {
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            },
+        )
+
+        started = time.monotonic()
+        result = await self.tools.get_issue("repo", 1)
+
+        assert time.monotonic() - started < 5
+        assert len(fake_github.requests) == 1
+        assert result == "GitHub API error (403): API rate limit exceeded for user."
+
+    async def test_secondary_limit_through_transport(self, fake_github):
+        fake_github.respond(
+            429,
+            {"message": "You have exceeded a secondary rate limit."},
+            {"Retry-After": "3"},
+        )
+        fake_github.respond(200, ISSUE_JSON)
+
+        with patch("tools.asyncio.sleep") as mock_sleep:
+            result = await self.tools.get_issue("repo", 1)
+
+        mock_sleep.assert_awaited_once_with(3.0)
+        assert len(fake_github.requests) == 2
+        assert result.startswith("#1 Some issue")
+
+    async def test_reset_too_far_returns_error(self):
+        mock_repo = MagicMock()
+        mock_repo.get_issue.side_effect = self._rate_limited(
+            {
+                "x-ratelimit-remaining": "0",
+                "x-ratelimit-reset": str(int(time.time()) + 3600),
+            }
+        )
+
+        with patch("tools.client") as mock_client, patch(
+            "tools.asyncio.sleep"
+        ) as mock_sleep:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.get_issue("repo", 1)
+
+        mock_sleep.assert_not_called()
+        assert "403" in result
+
+
+@pytest.mark.asyncio
 class TestGetIssue:
     """Tests for get_issue and update_issue tools."""
 
@@ -65,7 +396,7 @@ class TestGetIssue:
 
         self.tools = tools
 
-    def test_returns_issue_details(self):
+    async def test_returns_issue_details(self):
         mock_label = MagicMock()
         mock_label.name = "bug"
         mock_assignee = MagicMock()
@@ -87,8 +418,8 @@ class TestGetIssue:
         mock_repo.get_issue.return_value = mock_issue
 
         with patch("tools.client") as mock_client:
-            mock_client.get_repo.return_value = mock_repo
-            result = run(self.tools.get_issue("repo", 1))
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.get_issue("repo", 1)
 
         assert "#1 Add get_issue tool" in result
         assert "State: open" in result
@@ -96,7 +427,18 @@ class TestGetIssue:
         assert "EvieHwang" in result
         assert "We need this tool." in result
 
-    def test_issue_not_found(self):
+    async def test_does_not_fetch_repo_metadata(self):
+        mock_repo = MagicMock()
+        mock_repo.get_issue.return_value.body = ""
+
+        with patch("tools.client") as mock_client:
+            mock_client.lazy_repo.return_value = mock_repo
+            await self.tools.get_issue("repo", 1)
+
+        mock_client.get_repo.assert_not_called()
+        mock_client.lazy_repo.assert_called_once_with("repo")
+
+    async def test_issue_not_found(self):
         from github import GithubException
 
         mock_repo = MagicMock()
@@ -105,12 +447,13 @@ class TestGetIssue:
         )
 
         with patch("tools.client") as mock_client:
-            mock_client.get_repo.return_value = mock_repo
-            result = run(self.tools.get_issue("repo", 999))
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.get_issue("repo", 999)
 
         assert "404" in result
 
 
+@pytest.mark.asyncio
 class TestUpdateIssue:
     @pytest.fixture(autouse=True)
     def _import_tools(self):
@@ -118,7 +461,7 @@ class TestUpdateIssue:
 
         self.tools = tools
 
-    def test_closes_issue(self):
+    async def test_closes_issue(self):
         mock_issue = MagicMock()
         mock_issue.number = 1
         mock_issue.title = "Some issue"
@@ -129,13 +472,13 @@ class TestUpdateIssue:
         mock_repo.get_issue.return_value = mock_issue
 
         with patch("tools.client") as mock_client:
-            mock_client.get_repo.return_value = mock_repo
-            result = run(self.tools.update_issue("repo", 1, state="closed"))
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.update_issue("repo", 1, state="closed")
 
         mock_issue.edit.assert_called_once_with(state="closed")
         assert "Updated issue #1" in result
 
-    def test_update_multiple_fields(self):
+    async def test_update_multiple_fields(self):
         mock_issue = MagicMock()
         mock_issue.number = 1
         mock_issue.title = "New title"
@@ -146,11 +489,9 @@ class TestUpdateIssue:
         mock_repo.get_issue.return_value = mock_issue
 
         with patch("tools.client") as mock_client:
-            mock_client.get_repo.return_value = mock_repo
-            result = run(
-                self.tools.update_issue(
-                    "repo", 1, title="New title", labels="bug, urgent"
-                )
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.update_issue(
+                "repo", 1, title="New title", labels="bug, urgent"
             )
 
         mock_issue.edit.assert_called_once_with(
@@ -158,14 +499,415 @@ class TestUpdateIssue:
         )
         assert "Updated issue #1" in result
 
-    def test_no_fields_returns_message(self):
+    async def test_no_fields_returns_message(self):
         mock_issue = MagicMock()
         mock_repo = MagicMock()
         mock_repo.get_issue.return_value = mock_issue
 
         with patch("tools.client") as mock_client:
-            mock_client.get_repo.return_value = mock_repo
-            result = run(self.tools.update_issue("repo", 1))
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.update_issue("repo", 1)
 
         mock_issue.edit.assert_not_called()
         assert "No fields to update" in result
+
+
+@pytest.mark.asyncio
+class TestListIssues:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_single_label_lists_repository_issues(self):
+        node = {
+            "number": 1,
+            "title": "Real issue",
+            "state": "OPEN",
+            "labels": {"nodes": [{"name": "bug"}]},
+        }
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {
+                "repository": {"issues": {"nodes": [node]}}
+            }
+            result = await self.tools.list_issues("repo", labels="bug")
+
+        query, variables = mock_client.graphql.call_args.args
+        assert query is self.tools._ISSUES_QUERY
+        assert variables == {
+            "owner": "EvieHwang",
+            "name": "repo",
+            "states": ["OPEN"],
+            "labels": ["bug"],
+        }
+        assert result == "#1 Real issue [bug] (open)"
+
+    async def test_all_states_without_labels(self):
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {"repository": {"issues": {"nodes": []}}}
+            result = await self.tools.list_issues("repo", state="all")
+
+        variables = mock_client.graphql.call_args.args[1]
+        assert variables == {"owner": "EvieHwang", "name": "repo", "states": None}
+        assert result.startswith("No issues found")
+
+    async def test_multiple_labels_use_search(self):
+        node = {
+            "number": 1,
+            "title": "Real issue",
+            "state": "OPEN",
+            "labels": {"nodes": [{"name": "bug"}, {"name": "good first"}]},
+        }
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {"search": {"nodes": [node]}}
+            result = await self.tools.list_issues("repo", labels="bug, good first")
+
+        query, variables = mock_client.graphql.call_args.args
+        assert query is self.tools._ISSUE_SEARCH_QUERY
+        assert variables == {
+            "q": 'repo:EvieHwang/repo is:issue state:open label:"bug" '
+            'label:"good first" sort:created-desc'
+        }
+        assert result == "#1 Real issue [bug, good first] (open)"
+
+    async def test_multiple_labels_all_states_has_no_state_qualifier(self):
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {"search": {"nodes": []}}
+            await self.tools.list_issues("repo", state="all", labels="a,b")
+
+        variables = mock_client.graphql.call_args.args[1]
+        assert variables == {
+            "q": 'repo:EvieHwang/repo is:issue label:"a" label:"b" sort:created-desc'
+        }
+
+    async def test_invalid_state(self):
+        with patch("tools.client") as mock_client:
+            result = await self.tools.list_issues("repo", state="bogus")
+
+        mock_client.graphql.assert_not_called()
+        assert "Invalid state" in result
+
+
+@pytest.mark.asyncio
+class TestListRepos:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_formats_graphql_nodes(self):
+        nodes = [
+            {
+                "name": "app",
+                "description": "x" * 100,
+                "primaryLanguage": {"name": "Python"},
+                "isPrivate": True,
+            },
+            {
+                "name": "notes",
+                "description": None,
+                "primaryLanguage": None,
+                "isPrivate": False,
+            },
+        ]
+
+        with patch("tools.client") as mock_client:
+            mock_client.graphql.return_value = {
+                "viewer": {"repositories": {"nodes": nodes}}
+            }
+            result = await self.tools.list_repos(visibility="private")
+
+        assert mock_client.graphql.call_args.args[1] == {"privacy": "PRIVATE"}
+        assert result.splitlines() == [
+            f"- **app** [private] (Python) {'x' * 77}...",
+            "- **notes** [public] (—) ",
+        ]
+
+    async def test_all_visibility_sends_no_privacy_filter(self):
+        with patch("tools.client") as mock_client:
+            mock_client.graphql.return_value = {
+                "viewer": {"repositories": {"nodes": []}}
+            }
+            result = await self.tools.list_repos()
+
+        assert mock_client.graphql.call_args.args[1] == {"privacy": None}
+        assert result == "No repositories found."
+
+    async def test_invalid_visibility(self):
+        with patch("tools.client") as mock_client:
+            result = await self.tools.list_repos(visibility="internal")
+
+        mock_client.graphql.assert_not_called()
+        assert "Invalid visibility" in result
+
+
+@pytest.mark.asyncio
+class TestListPrs:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_closed_includes_merged(self):
+        nodes = [
+            {
+                "number": 3,
+                "title": "Merged one",
+                "state": "MERGED",
+                "headRefName": "feature",
+                "baseRefName": "main",
+            },
+            {
+                "number": 2,
+                "title": "Dropped one",
+                "state": "CLOSED",
+                "headRefName": "spike",
+                "baseRefName": "main",
+            },
+        ]
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {
+                "repository": {"pullRequests": {"nodes": nodes}}
+            }
+            result = await self.tools.list_prs("repo", state="closed")
+
+        assert mock_client.graphql.call_args.args[1] == {
+            "owner": "EvieHwang",
+            "name": "repo",
+            "states": ["CLOSED", "MERGED"],
+        }
+        assert result.splitlines() == [
+            "#3 Merged one (closed) [feature -> main]",
+            "#2 Dropped one (closed) [spike -> main]",
+        ]
+
+    async def test_open_pr_and_state_filter(self):
+        node = {
+            "number": 1,
+            "title": "WIP",
+            "state": "OPEN",
+            "headRefName": "wip",
+            "baseRefName": "main",
+        }
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = {
+                "repository": {"pullRequests": {"nodes": [node]}}
+            }
+            result = await self.tools.list_prs("repo")
+
+        assert mock_client.graphql.call_args.args[1]["states"] == ["OPEN"]
+        assert result == "#1 WIP (open) [wip -> main]"
+
+    async def test_invalid_state(self):
+        with patch("tools.client") as mock_client:
+            result = await self.tools.list_prs("repo", state="merged")
+
+        mock_client.graphql.assert_not_called()
+        assert "Invalid state" in result
+
+
+@pytest.mark.asyncio
+class TestSearchCode:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_single_raw_request(self):
+        items = [
+            {"path": f"file{i}.py", "repository": {"full_name": "EvieHwang/repo"}}
+            for i in range(20)
+        ]
+
+        with patch("tools.client") as mock_client:
+            mock_client._username = "EvieHwang"
+            mock_client.rest.return_value = {"total_count": 100, "items": items}
+            result = await self.tools.search_code("needle")
+
+        mock_client.rest.assert_called_once_with(
+            "GET", "/search/code", {"q": "needle user:EvieHwang", "per_page": 20}
+        )
+        mock_client.full_name.assert_not_called()
+        lines = result.splitlines()
+        assert len(lines) == 20
+        assert lines[0] == "- EvieHwang/repo/file0.py"
+
+    async def test_scopes_to_normalized_repo(self):
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.rest.return_value = {"total_count": 0, "items": []}
+            result = await self.tools.search_code("needle", repo="repo")
+
+        query = mock_client.rest.call_args.args[2]["q"]
+        assert query == "needle repo:EvieHwang/repo"
+        assert result == "No code found matching: needle"
+
+
+@pytest.mark.asyncio
+class TestReadFile:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_decodes_inline_content(self):
+        content = MagicMock(encoding="base64", content="aGVsbG8=")
+        mock_repo = MagicMock()
+        mock_repo.get_contents.return_value = content
+
+        with patch("tools.client") as mock_client:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.read_file("repo", "a.txt")
+
+        assert result == "hello"
+        mock_repo.get_git_blob.assert_not_called()
+
+    async def test_large_file_fetches_blob(self):
+        content = MagicMock(encoding="none", content="", sha="abc")
+        mock_repo = MagicMock()
+        mock_repo.get_contents.return_value = content
+        mock_repo.get_git_blob.return_value = MagicMock(
+            encoding="base64", content="aGVsbG8="
+        )
+
+        with patch("tools.client") as mock_client:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.read_file("repo", "big.txt")
+
+        mock_repo.get_git_blob.assert_called_once_with("abc")
+        assert result == "hello"
+
+    async def test_binary_file_returns_metadata(self):
+        content = MagicMock(encoding="base64", content="/w==", size=1, sha="abc")
+        content.name = "logo.png"
+        mock_repo = MagicMock()
+        mock_repo.get_contents.return_value = content
+
+        with patch("tools.client") as mock_client:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.read_file("repo", "logo.png")
+
+        assert result.startswith("Binary file: logo.png")
+
+
+@pytest.mark.asyncio
+class TestWriteFile:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    def _target(self, file=None, ref_key="defaultBranchRef"):
+        return {
+            "repository": {
+                "isEmpty": False,
+                ref_key: {"name": "main", "target": {"oid": "head123"}},
+                "file": file,
+            }
+        }
+
+    async def test_creates_new_file_in_one_commit(self):
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.side_effect = [self._target(), {}]
+            result = await self.tools.write_file(
+                "repo", "a.txt", "hello", "Add a\n\nDetails"
+            )
+
+        query_vars = mock_client.graphql.call_args_list[0].args[1]
+        assert query_vars["useDefault"] is True
+        assert query_vars["expression"] == "HEAD:a.txt"
+        commit_input = mock_client.graphql.call_args_list[1].args[1]["input"]
+        assert commit_input["expectedHeadOid"] == "head123"
+        assert commit_input["branch"]["branchName"] == "main"
+        assert commit_input["message"] == {"headline": "Add a", "body": "Details"}
+        assert commit_input["fileChanges"]["additions"] == [
+            {"path": "a.txt", "contents": "aGVsbG8="}
+        ]
+        assert result.startswith("Created a.txt in EvieHwang/repo")
+
+    async def test_updates_existing_file_on_branch(self):
+        target = self._target(file={"__typename": "Blob"}, ref_key="ref")
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.side_effect = [target, {}]
+            result = await self.tools.write_file(
+                "repo", "a.txt", "hello", "Edit a", branch="feature"
+            )
+
+        query_vars = mock_client.graphql.call_args_list[0].args[1]
+        assert query_vars["branch"] == "refs/heads/feature"
+        assert query_vars["expression"] == "refs/heads/feature:a.txt"
+        assert result.startswith("Updated a.txt")
+
+    async def test_empty_repo_uses_contents_api(self):
+        target = {
+            "repository": {"isEmpty": True, "defaultBranchRef": None, "file": None}
+        }
+        mock_repo = MagicMock()
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = target
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.write_file("repo", "README.md", "hi", "Init")
+
+        assert mock_client.graphql.call_count == 1
+        mock_repo.create_file.assert_called_once_with("README.md", "Init", "hi")
+        assert result == "Created README.md in EvieHwang/repo (commit: Init)"
+
+    async def test_directory_is_rejected(self):
+        target = self._target(file={"__typename": "Tree"})
+
+        with patch("tools.client") as mock_client:
+            mock_client.full_name.return_value = "EvieHwang/repo"
+            mock_client.graphql.return_value = target
+            result = await self.tools.write_file("repo", "src", "x", "msg")
+
+        assert mock_client.graphql.call_count == 1
+        assert result == "Path is a directory: src"
+
+
+@pytest.mark.asyncio
+class TestListFiles:
+    @pytest.fixture(autouse=True)
+    def _import_tools(self):
+        import tools
+
+        self.tools = tools
+
+    async def test_listing_does_not_complete_lazy_entries(self):
+        from github.ContentFile import ContentFile
+
+        requester = MagicMock()
+        requester.requestJsonAndCheck.side_effect = AssertionError("extra GET")
+        file_entry = {"type": "file", "name": "b.py", "size": 10}
+        listing = [
+            ContentFile(requester, {}, file_entry, completed=False),
+            ContentFile(requester, {}, {"type": "dir", "name": "src"}, completed=True),
+        ]
+        mock_repo = MagicMock()
+        mock_repo.get_contents.return_value = listing
+
+        with patch("tools.client") as mock_client:
+            mock_client.lazy_repo.return_value = mock_repo
+            result = await self.tools.list_files("repo")
+
+        assert result == "[DIR] src\n[FILE] b.py  10 bytes"
@@ -1,20 +1,71 @@
 """GitHub MCP tool implementations."""
 
+import asyncio
 import base64
 import functools
+import logging
+import random
+import time
 
 from github import GithubException
 
 from github_client import client, GitHubClientError
 
+logger = logging.getLogger(__name__)
+
+# Longest we will sleep on a rate limit before giving the error back instead
+RATE_LIMIT_MAX_WAIT = 60
+
+
+def _rate_limit_wait(e: GithubException) -> float | None:
+    """Seconds to wait before retrying a rate-limited call.
+
+    Returns None when the error is not a rate limit or the reset is too far off.
+    """
+    if e.status not in (403, 429):
+        return None
+    headers = {k.lower(): v for k, v in (e.headers or {}).items()}
+    if "retry-after" in headers:
+        # Secondary limits: GitHub says exactly how long to back off
+        try:
+            wait = float(headers["retry-after"])
+        except ValueError:
+            return None  # HTTP-date form; let the original error through
+    elif headers.get("x-ratelimit-remaining") == "0":
+        reset = float(headers.get("x-ratelimit-reset", 0))
+        wait = max(0.0, reset - time.time()) + random.uniform(0, 1)
+    else:
+        return None
+    return wait if wait <= RATE_LIMIT_MAX_WAIT else None
+
 
 def _handle_errors(func):
-    """Decorator to catch common GitHub errors."""
+    """Decorator to catch common GitHub errors.
+
+    Tools are plain functions making blocking PyGithub calls; the wrapper runs
+    them in a worker thread so concurrent MCP requests don't serialize on the
+    event loop. Rate-limited calls are retried once after the limit resets.
+    """
 
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
         try:
-            return await func(*args, **kwargs)
+            try:
+                return await asyncio.to_thread(func, *args, **kwargs)
+            except GithubException as e:
+                wait = _rate_limit_wait(e)
+                if wait is None:
+                    raise
+                remaining = (e.headers or {}).get("x-ratelimit-remaining", "?")
+                logger.warning(
+                    "%s rate limited (status %s, remaining %s); retrying in %.1fs",
+                    func.__name__,
+                    e.status,
+                    remaining,
+                    wait,
+                )
+                await asyncio.sleep(wait)
+                return await asyncio.to_thread(func, *args, **kwargs)
         except GitHubClientError as e:
             return str(e)
         except GithubException as e:
@@ -25,30 +76,148 @@ def _handle_errors(func):
     return wrapper
 
 
+# GraphQL queries for the list tools: one request returns every field
+# shown, instead of a REST page plus per-item lazy loads.
+
+_REPOS_QUERY = """
+query($privacy: RepositoryPrivacy) {
+  viewer {
+    repositories(
+      first: 50
+      privacy: $privacy
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      nodes { name description primaryLanguage { name } isPrivate }
+    }
+  }
+}
+"""
+
+_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!], $labels: [String!]) {
+  repository(owner: $owner, name: $name) {
+    issues(
+      first: 50
+      states: $states
+      labels: $labels
+      orderBy: {field: CREATED_AT, direction: DESC}
+    ) {
+      nodes { number title state labels(first: 10) { nodes { name } } }
+    }
+  }
+}
+"""
+
+# The issues connection ORs its labels argument; when several labels must
+# all match, fall back to search, whose repeated label: qualifiers are ANDed.
+# The search index is eventually consistent, so results can lag new changes.
+_ISSUE_SEARCH_QUERY = """
+query($q: String!) {
+  search(type: ISSUE, query: $q, first: 50) {
+    nodes { ... on Issue { number title state labels(first: 10) { nodes { name } } } }
+  }
+}
+"""
+
+_PRS_QUERY = """
+query($owner: String!, $name: String!, $states: [PullRequestState!]) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(
+      first: 50
+      states: $states
+      orderBy: {field: CREATED_AT, direction: DESC}
+    ) {
+      nodes { number title state headRefName baseRefName }
+    }
+  }
+}
+"""
+
+# write_file: resolve the branch head and whether the path exists in one
+# query, then commit with a single mutation (no separate exists-check).
+
+_WRITE_TARGET_QUERY = """
+query(
+  $owner: String!
+  $name: String!
+  $branch: String!
+  $useDefault: Boolean!
+  $expression: String!
+) {
+  repository(owner: $owner, name: $name) {
+    isEmpty
+    defaultBranchRef @include(if: $useDefault) { name target { oid } }
+    ref(qualifiedName: $branch) @skip(if: $useDefault) { name target { oid } }
+    file: object(expression: $expression) { __typename }
+  }
+}
+"""
+
+_COMMIT_MUTATION = """
+mutation($input: CreateCommitOnBranchInput!) {
+  createCommitOnBranch(input: $input) { commit { oid } }
+}
+"""
+
+_VISIBILITY_PRIVACY = {"all": None, "public": "PUBLIC", "private": "PRIVATE"}
+_ISSUE_STATES = {"open": ["OPEN"], "closed": ["CLOSED"], "all": None}
+_PR_STATES = {"open": ["OPEN"], "closed": ["CLOSED", "MERGED"], "all": None}
+
+
+def _owner_and_name(repo: str) -> dict:
+    owner, name = client.full_name(repo).split("/", 1)
+    return {"owner": owner, "name": name}
+
+
+def _format_repo_row(node: dict) -> str:
+    vis = "private" if node["isPrivate"] else "public"
+    lang = (node["primaryLanguage"] or {}).get("name") or "—"
+    desc = node["description"] or ""
+    if len(desc) > 80:
+        desc = desc[:77] + "..."
+    return f"- **{node['name']}** [{vis}] ({lang}) {desc}"
+
+
+def _format_issue_row(node: dict) -> str:
+    label_str = ", ".join(lb["name"] for lb in node["labels"]["nodes"])
+    label_part = f" [{label_str}]" if label_str else ""
+    return f"#{node['number']} {node['title']}{label_part} ({node['state'].lower()})"
+
+
+def _format_file_row(item) -> str:
+    kind = "DIR" if item.type == "dir" else "FILE"
+    size = f"  {item.size} bytes" if item.type == "file" else ""
+    return f"[{kind}] {item.name}{size}"
+
+
+def _format_pr_row(node: dict) -> str:
+    # REST reports merged PRs as closed; keep that wording
+    state = "open" if node["state"] == "OPEN" else "closed"
+    return (
+        f"#{node['number']} {node['title']} ({state}) "
+        f"[{node['headRefName']} -> {node['baseRefName']}]"
+    )
+
+
 @_handle_errors
-async def list_repos(visibility: str = "all") -> str:
+def list_repos(visibility: str = "all") -> str:
     """List repositories for the authenticated user.
 
     Args:
         visibility: Filter by visibility: 'all', 'public', or 'private'.
     """
-    repos = client.user.get_repos(visibility=visibility, sort="updated")
-    lines = []
-    for repo in repos[:50]:
-        vis = "private" if repo.private else "public"
-        lang = repo.language or "—"
-        desc = repo.description or ""
-        if len(desc) > 80:
-            desc = desc[:77] + "..."
-        lines.append(f"- **{repo.name}** [{vis}] ({lang}) {desc}")
+    if visibility not in _VISIBILITY_PRIVACY:
+        return f"Invalid visibility: {visibility} (use 'all', 'public', or 'private')."
 
-    if not lines:
-        return "No repositories found."
-    return "\n".join(lines)
+    data = client.graphql(_REPOS_QUERY, {"privacy": _VISIBILITY_PRIVACY[visibility]})
+    nodes = data["viewer"]["repositories"]["nodes"]
+    result = "\n".join(_format_repo_row(n) for n in nodes)
+    return result or "No repositories found."
 
 
 @_handle_errors
-async def get_repo(repo: str) -> str:
+def get_repo(repo: str) -> str:
     """Get repository details.
 
     Args:
@@ -67,7 +236,7 @@ async def get_repo(repo: str) -> str:
 
 
 @_handle_errors
-async def list_files(repo: str, path: str = "", ref: str = "") -> str:
+def list_files(repo: str, path: str = "", ref: str = "") -> str:
     """List files and directories at a path in a repository.
 
     Args:
@@ -75,7 +244,7 @@ async def list_files(repo: str, path: str = "", ref: str = "") -> str:
         path: Path within the repo (default: root).
         ref: Branch or commit ref (default: repo's default branch).
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     kwargs = {}
     if ref:
         kwargs["ref"] = ref
@@ -84,19 +253,15 @@ async def list_files(repo: str, path: str = "", ref: str = "") -> str:
     if not isinstance(contents, list):
         contents = [contents]
 
-    lines = []
-    for item in sorted(contents, key=lambda x: (x.type != "dir", x.name.lower())):
-        kind = "DIR" if item.type == "dir" else "FILE"
-        size = f"  {item.size} bytes" if item.type == "file" else ""
-        lines.append(f"[{kind}] {item.name}{size}")
-
-    if not lines:
-        return f"Empty directory: {path or '/'}"
-    return "\n".join(lines)
+    result = "\n".join(
+        _format_file_row(item)
+        for item in sorted(contents, key=lambda x: (x.type != "dir", x.name.lower()))
+    )
+    return result or f"Empty directory: {path or '/'}"
 
 
 @_handle_errors
-async def read_file(repo: str, path: str, ref: str = "") -> str:
+def read_file(repo: str, path: str, ref: str = "") -> str:
     """Read a file from a repository.
 
     Args:
@@ -104,7 +269,7 @@ async def read_file(repo: str, path: str, ref: str = "") -> str:
         path: File path within the repo.
         ref: Branch or commit ref (default: repo's default branch).
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     kwargs = {}
     if ref:
         kwargs["ref"] = ref
@@ -114,20 +279,27 @@ async def read_file(repo: str, path: str, ref: str = "") -> str:
         return f"Path is a directory, not a file: {path}"
 
     if content.encoding == "base64":
-        try:
-            return base64.b64decode(content.content).decode("utf-8")
-        except UnicodeDecodeError:
-            return (
-                f"Binary file: {content.name}\n"
-                f"Size: {content.size} bytes\n"
-                f"SHA: {content.sha}"
-            )
+        raw = base64.b64decode(content.content)
+    else:
+        # Files over 1 MB come back without inline content; fetch the blob once
+        blob = r.get_git_blob(content.sha)
+        if blob.encoding == "base64":
+            raw = base64.b64decode(blob.content)
+        else:
+            raw = blob.content.encode("utf-8")
 
-    return content.decoded_content.decode("utf-8")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return (
+            f"Binary file: {content.name}\n"
+            f"Size: {content.size} bytes\n"
+            f"SHA: {content.sha}"
+        )
 
 
 @_handle_errors
-async def write_file(
+def write_file(
     repo: str, path: str, content: str, message: str, branch: str = ""
 ) -> str:
     """Create or update a file in a repository.
@@ -139,27 +311,54 @@ async def write_file(
         message: Commit message.
         branch: Branch name (default: repo's default branch).
     """
-    r = client.get_repo(repo)
-    kwargs = {}
-    if branch:
-        kwargs["branch"] = branch
-
-    # Check if file exists to get SHA for update
-    try:
-        existing = r.get_contents(path, **kwargs)
-        if isinstance(existing, list):
-            return f"Path is a directory: {path}"
-        r.update_file(path, message, content, existing.sha, **kwargs)
-        return f"Updated {path} in {r.full_name} (commit: {message})"
-    except GithubException as e:
-        if e.status == 404:
-            r.create_file(path, message, content, **kwargs)
-            return f"Created {path} in {r.full_name} (commit: {message})"
-        raise
+    full_name = client.full_name(repo)
+    variables = _owner_and_name(repo)
+    qualified = f"refs/heads/{branch}" if branch else ""
+    variables.update(
+        branch=qualified,
+        useDefault=not branch,
+        # Fully qualified so a same-named tag can't shadow the branch
+        expression=f"{qualified or 'HEAD'}:{path}",
+    )
+    target = client.graphql(_WRITE_TARGET_QUERY, variables)
+    repository = target["repository"]
+    if repository["isEmpty"]:
+        # createCommitOnBranch needs an existing head; the contents API can
+        # make the first commit of an empty repo
+        kwargs = {"branch": branch} if branch else {}
+        client.lazy_repo(repo).create_file(path, message, content, **kwargs)
+        client.invalidate_repo(repo)
+        return f"Created {path} in {full_name} (commit: {message})"
+
+    head = repository["ref"] if branch else repository["defaultBranchRef"]
+    if head is None:
+        return f"Branch not found: {branch or '(default)'} in {full_name}"
+    existing = repository["file"]
+    if existing is not None and existing["__typename"] == "Tree":
+        return f"Path is a directory: {path}"
+
+    headline, _, body = message.partition("\n")
+    commit_input = {
+        "branch": {"repositoryNameWithOwner": full_name, "branchName": head["name"]},
+        "expectedHeadOid": head["target"]["oid"],
+        "message": {"headline": headline, "body": body.strip()},
+        "fileChanges": {
+            "additions": [
+                {
+                    "path": path,
+                    "contents": base64.b64encode(content.encode("utf-8")).decode(),
+                }
+            ]
+        },
+    }
+    client.graphql(_COMMIT_MUTATION, {"input": commit_input})
+    client.invalidate_repo(repo)
+    verb = "Updated" if existing is not None else "Created"
+    return f"{verb} {path} in {full_name} (commit: {message})"
 
 
 @_handle_errors
-async def create_repo(
+def create_repo(
     name: str,
     description: str = "",
     private: bool = True,
@@ -187,35 +386,42 @@ async def create_repo(
 
 
 @_handle_errors
-async def list_issues(repo: str, state: str = "open", labels: str = "") -> str:
+def list_issues(repo: str, state: str = "open", labels: str = "") -> str:
     """List issues for a repository.
 
     Args:
         repo: Repository name (e.g., 'my-repo' or 'owner/repo').
         state: Filter by state: 'open', 'closed', or 'all'.
-        labels: Comma-separated label names to filter by.
+        labels: Comma-separated label names to filter by. Issues must have
+            all of them; with more than one label the results come from
+            GitHub search and may lag very recent changes.
     """
-    r = client.get_repo(repo)
-    kwargs = {"state": state}
-    if labels:
-        kwargs["labels"] = [lb.strip() for lb in labels.split(",")]
-
-    issues = r.get_issues(**kwargs)
-    lines = []
-    for issue in issues[:50]:
-        if issue.pull_request:
-            continue
-        label_str = ", ".join(lb.name for lb in issue.labels) if issue.labels else ""
-        label_part = f" [{label_str}]" if label_str else ""
-        lines.append(f"#{issue.number} {issue.title}{label_part} ({issue.state})")
+    if state not in _ISSUE_STATES:
+        return f"Invalid state: {state} (use 'open', 'closed', or 'all')."
+
+    label_names = [lb.strip() for lb in labels.split(",") if lb.strip()]
+    if len(label_names) > 1:
+        qualifiers = [f"repo:{client.full_name(repo)}", "is:issue"]
+        if state != "all":
+            qualifiers.append(f"state:{state}")
+        qualifiers += [f'label:"{lb}"' for lb in label_names]
+        qualifiers.append("sort:created-desc")
+        data = client.graphql(_ISSUE_SEARCH_QUERY, {"q": " ".join(qualifiers)})
+        nodes = data["search"]["nodes"]
+    else:
+        variables = _owner_and_name(repo)
+        variables["states"] = _ISSUE_STATES[state]
+        if label_names:
+            variables["labels"] = label_names
+        data = client.graphql(_ISSUES_QUERY, variables)
+        nodes = data["repository"]["issues"]["nodes"]
 
-    if not lines:
-        return f"No issues found in {r.full_name} with state={state}."
-    return "\n".join(lines)
+    result = "\n".join(_format_issue_row(n) for n in nodes)
+    return result or f"No issues found in {client.full_name(repo)} with state={state}."
 
 
 @_handle_errors
-async def create_issue(
+def create_issue(
     repo: str,
     title: str,
     body: str = "",
@@ -231,7 +437,7 @@ async def create_issue(
         labels: Comma-separated label names.
         assignees: Comma-separated GitHub usernames to assign.
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     kwargs = {"title": title}
     if body:
         kwargs["body"] = body
@@ -245,28 +451,29 @@ async def create_issue(
 
 
 @_handle_errors
-async def list_prs(repo: str, state: str = "open") -> str:
+def list_prs(repo: str, state: str = "open") -> str:
     """List pull requests for a repository.
 
     Args:
         repo: Repository name (e.g., 'my-repo' or 'owner/repo').
         state: Filter by state: 'open', 'closed', or 'all'.
     """
-    r = client.get_repo(repo)
-    pulls = r.get_pulls(state=state)
-    lines = []
-    for pr in pulls[:50]:
-        lines.append(
-            f"#{pr.number} {pr.title} ({pr.state}) [{pr.head.ref} -> {pr.base.ref}]"
-        )
+    if state not in _PR_STATES:
+        return f"Invalid state: {state} (use 'open', 'closed', or 'all')."
 
-    if not lines:
-        return f"No pull requests found in {r.full_name} with state={state}."
-    return "\n".join(lines)
+    variables = _owner_and_name(repo)
+    variables["states"] = _PR_STATES[state]
+
+    data = client.graphql(_PRS_QUERY, variables)
+    nodes = data["repository"]["pullRequests"]["nodes"]
+    result = "\n".join(_format_pr_row(n) for n in nodes)
+    return result or (
+        f"No pull requests found in {client.full_name(repo)} with state={state}."
+    )
 
 
 @_handle_errors
-async def create_branch(repo: str, branch: str, from_branch: str = "") -> str:
+def create_branch(repo: str, branch: str, from_branch: str = "") -> str:
     """Create a new branch in a repository.
 
     Args:
@@ -274,47 +481,47 @@ async def create_branch(repo: str, branch: str, from_branch: str = "") -> str:
         branch: Name for the new branch.
         from_branch: Base branch (default: repo's default branch).
     """
-    r = client.get_repo(repo)
-    base = from_branch or r.default_branch
+    # Only fetch repo metadata when the default branch is needed
+    if from_branch:
+        r = client.lazy_repo(repo)
+        base = from_branch
+    else:
+        r = client.get_repo(repo)
+        base = r.default_branch
     source = r.get_branch(base)
     r.create_git_ref(f"refs/heads/{branch}", source.commit.sha)
-    return f"Created branch '{branch}' from '{base}' in {r.full_name}"
+    client.invalidate_repo(repo)
+    return f"Created branch '{branch}' from '{base}' in {client.full_name(repo)}"
 
 
 @_handle_errors
-async def search_code(query: str, repo: str = "") -> str:
+def search_code(query: str, repo: str = "") -> str:
     """Search for code across repositories.
 
     Args:
         query: Search query (code to find).
         repo: Optional repo to scope search to (e.g., 'my-repo' or 'owner/repo').
     """
-    if repo:
-        if "/" not in repo:
-            repo = f"{client._username}/{repo}"
-        full_query = f"{query} repo:{repo}"
-    else:
-        full_query = f"{query} user:{client._username}"
-
-    results = client.github.search_code(full_query)
-    lines = []
-    for item in results[:20]:
-        lines.append(f"- {item.repository.full_name}/{item.path}")
+    scope = f"repo:{client.full_name(repo)}" if repo else f"user:{client._username}"
+    full_query = " ".join((query, scope))
 
-    if not lines:
-        return f"No code found matching: {query}"
-    return "\n".join(lines)
+    # One page of raw JSON; each item already carries its repository
+    data = client.rest("GET", "/search/code", {"q": full_query, "per_page": 20})
+    result = "\n".join(
+        f"- {item['repository']['full_name']}/{item['path']}" for item in data["items"]
+    )
+    return result or f"No code found matching: {query}"
 
 
 @_handle_errors
-async def get_issue(repo: str, issue_number: int) -> str:
+def get_issue(repo: str, issue_number: int) -> str:
     """Get issue details.
 
     Args:
         repo: Repository name (e.g., 'my-repo' or 'owner/repo').
         issue_number: Issue number.
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     issue = r.get_issue(issue_number)
     labels = ", ".join(lb.name for lb in issue.labels) if issue.labels else "none"
     assignees = (
@@ -337,7 +544,7 @@ async def get_issue(repo: str, issue_number: int) -> str:
 
 
 @_handle_errors
-async def update_issue(
+def update_issue(
     repo: str,
     issue_number: int,
     title: str = "",
@@ -357,7 +564,7 @@ async def update_issue(
         labels: Comma-separated label names (replaces existing).
         assignees: Comma-separated GitHub usernames (replaces existing).
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     issue = r.get_issue(issue_number)
     kwargs = {}
     if title:
@@ -382,14 +589,14 @@ async def update_issue(
 
 
 @_handle_errors
-async def get_pr(repo: str, pr_number: int) -> str:
+def get_pr(repo: str, pr_number: int) -> str:
     """Get pull request details.
 
     Args:
         repo: Repository name (e.g., 'my-repo' or 'owner/repo').
         pr_number: Pull request number.
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     pr = r.get_pull(pr_number)
     return (
         f"#{pr.number} {pr.title}\n"
@@ -403,7 +610,7 @@ async def get_pr(repo: str, pr_number: int) -> str:
 
 
 @_handle_errors
-async def merge_pr(repo: str, pr_number: int, merge_method: str = "squash") -> str:
+def merge_pr(repo: str, pr_number: int, merge_method: str = "squash") -> str:
     """Merge a pull request.
 
     Args:
@@ -411,7 +618,7 @@ async def merge_pr(repo: str, pr_number: int, merge_method: str = "squash") -> s
         pr_number: Pull request number.
         merge_method: Merge strategy: 'merge', 'squash', or 'rebase'.
     """
-    r = client.get_repo(repo)
+    r = client.lazy_repo(repo)
     pr = r.get_pull(pr_number)
     result = pr.merge(merge_method=merge_method)
     if result.merged: